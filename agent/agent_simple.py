@@ -40,7 +40,6 @@ Follow these steps to resolve the issue:
 After editing or creating files, always use bash tool immediately, as they are working sequentially. Use <thoughts> and <actions> tags before using any tools. Your thinking should be thorough and so it's fine if it's very long.
 """
 
-@observe()
 async def run_agent(thread_id: str, container_name: str, problem_file: str, threads_dir: str, max_iterations: int = 10, model_name: str = "sonnet"):
     thread_manager = ThreadManager(threads_dir=threads_dir)
     state_file = os.path.join(threads_dir, thread_id, 'state.json')
@@ -56,8 +55,6 @@ async def run_agent(thread_id: str, container_name: str, problem_file: str, thre
             if message['role'] == 'user' and continue_instructions in message['content']:
                 await thread_manager.remove_message(thread_id, i)
         
-        workspace = await state_manager.get("workspace")
-        
 #         Your current workspace state (similar to VS Code):
 # <current_state>
 # {workspace}
@@ -84,23 +81,23 @@ async def run_agent(thread_id: str, container_name: str, problem_file: str, thre
     from tools.repo_tool import RepositoryTools
     thread_manager.add_tool(RepositoryTools, container_name=container_name, state_file=state_file)
 
-    from tools.edit_tool import EditTool
+    from tools.edit_and_run_tool import EditTool
     from tools.bash_tool import BashTool
-    thread_manager.add_tool(EditTool, container_name=container_name, state_file=state_file)
     thread_manager.add_tool(BashTool, container_name=container_name, state_file=state_file)
+    # EditTool runs its commands through the registered BashTool instead of opening its own sessions
+    bash_tool = thread_manager.tool_registry.get_tool("bash_command")["instance"]
+    thread_manager.add_tool(EditTool, container_name=container_name, state_file=state_file, bash_tool=bash_tool)
 
-    # Format the system prompt with the problem statement
-    system = system_prompt.format(problem_statement=problem_statement)
-    
+    # The inline system prompt has no placeholders, so it is used as-is
     system_message = {
         "role": "system",
-        "content": system + continue_instructions
+        "content": system_prompt + continue_instructions
     }
 
-    await thread_manager.add_message(thread_id, {
+    user_message = {
         "role": "user", 
         "content": user_prompt.format(problem_statement=problem_statement)
-    })
+    }
       
     # Add initial prefill message
     prefill_message = {
@@ -138,50 +135,57 @@ async def run_agent(thread_id: str, container_name: str, problem_file: str, thre
             }
         ]
     }
-    await thread_manager.add_message(thread_id, prefill_message)
-    await thread_manager.process_tool_calls_from_message(thread_id, prefill_message)
-
-    iteration = 0
-
-    while iteration < max_iterations:
-        iteration += 1
-
-        model_mapping = {
-            "sonnet": "anthropic/claude-3-5-sonnet-latest",
-            "haiku": "anthropic/claude-3-5-haiku-latest",
-            "deepseek": "deepseek/deepseek-chat",
-            "gpt-4o": "gpt-4o",
-            "qwen": "openrouter/qwen/qwen-2.5-coder-32b-instruct",
-        }
-        model_name_full = model_mapping.get(model_name, "anthropic/claude-3-5-sonnet-latest")  
-
-        response = await thread_manager.run_thread(
-            thread_id=thread_id,
-            system_message=system_message,
-            model_name=model_name_full,
-            temperature=0.0,
-            max_tokens=8192,
-            tool_choice="any",
-            execute_tools_async=False,
-            use_tools=True,
-            execute_model_tool_calls=True
-        )
+    try:
+        await thread_manager.add_messages(thread_id, [user_message, prefill_message])
+        await thread_manager.process_tool_calls_from_message(thread_id, prefill_message)
 
-        print(f"Iteration {iteration}/{max_iterations}:")
+        iteration = 0
 
-        await after_iteration()
+        while iteration < max_iterations:
+            iteration += 1
 
-        # Check for 'submit' tool call in the assistant's last message
-        assistant_messages = await thread_manager.list_messages(thread_id, only_latest_assistant=True)
-        if assistant_messages:
-            last_assistant = assistant_messages[0]
-            tool_calls = last_assistant.get('tool_calls', [])
-            for tool_call in tool_calls:
-                if tool_call['function']['name'] == 'submit':
-                    print("Task completed via submit tool, stopping...")
-                    return
-
-    print(f"Agent completed after {iteration} iterations")
+            model_mapping = {
+                "sonnet": "anthropic/claude-3-5-sonnet-latest",
+                "haiku": "anthropic/claude-3-5-haiku-latest",
+                "deepseek": "deepseek/deepseek-chat",
+                "gpt-4o": "gpt-4o",
+                "qwen": "openrouter/qwen/qwen-2.5-coder-32b-instruct",
+            }
+            model_name_full = model_mapping.get(model_name, "anthropic/claude-3-5-sonnet-latest")  
+
+            response = await thread_manager.run_thread(
+                thread_id=thread_id,
+                system_message=system_message,
+                model_name=model_name_full,
+                temperature=0.0,
+                max_tokens=8192,
+                tool_choice="any",
+                execute_tools_async=False,
+                use_tools=True,
+                execute_model_tool_calls=True
+            )
+
+            print(f"Iteration {iteration}/{max_iterations}:")
+
+            await after_iteration()
+
+            # Check for 'submit' tool call in the assistant's last message
+            assistant_messages = await thread_manager.list_messages(thread_id, only_latest_assistant=True)
+            if assistant_messages:
+                last_assistant = assistant_messages[0]
+                tool_calls = last_assistant.get('tool_calls', [])
+                for tool_call in tool_calls:
+                    if tool_call['function']['name'] == 'submit':
+                        print("Task completed via submit tool, stopping...")
+                        return
+
+        print(f"Agent completed after {iteration} iterations")
+    finally:
+        # Close the container sessions opened by the tools
+        await thread_manager.close_tools()
+
+# Only trace the agent run when Langfuse is configured
+run_agent = observe()(run_agent) if os.environ.get('LANGFUSE_PUBLIC_KEY') else run_agent
 
 if __name__ == "__main__":
     async def main():
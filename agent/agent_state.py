@@ -10,16 +10,17 @@ import agentops
 agentops.init(os.environ['AGENTOPS_API_KEY'])
 agentops.init(os.environ['OPENROUTER_API_KEY'])
 
+# Tool examples go last so the static instructions form a stable, cacheable prefix
 system_prompt = """You are an autonomous expert software engineer tasked with making precise, high-quality modifications to resolve specific issues in a Python code repository. Your goal is to analyze the problem, propose solutions, and implement the best fix while maintaining code quality and efficiency.
 
+NOTE ABOUT THE <edit_file> tool: Indentation really matters! When editing a file, make sure to insert appropriate indentation before each line!
+
+TIP: If you are working on a Django repository, recommended command: <run_bash command="/testbed/tests/runtests.py --verbosity 1 --settings=test_sqlite example.test_example" />
+
 Available XML tools to interact with the workspace:
 <xml_tools>
 {xml_format}
 </xml_tools>
-
-NOTE ABOUT THE <edit_file> tool: Indentation really matters! When editing a file, make sure to insert appropriate indentation before each line!
-
-TIP: If you are working on a Django repository, recommended command: <run_bash command="/testbed/tests/runtests.py --verbosity 1 --settings=test_sqlite example.test_example" />
 """
 
 user_prompt = """First, examine the current state of the workspace:
@@ -40,54 +41,54 @@ A Python code repository has been uploaded to the `/testbed` directory. Consider
 Follow this systematic approach to address the issue:
 
 1. Initial Assessment
-   - Review workspace files and the PR description.
-   - Identify key components and their relationships.
-   - Document your initial observations and concerns.
-   - Ensure relevant files and existing tests are opened.
-   - Understand their functionality in relation to the PR description.
+  - Review workspace files and the PR description.
+  - Identify key components and their relationships.
+  - Document your initial observations and concerns.
+  - Ensure relevant files and existing tests are opened.
+  - Understand their functionality in relation to the PR description.
 
 2. Detailed Analysis
-   - Examine relevant files in depth.
-   - Map out dependencies and interactions between components.
-   - Identify areas that may be impacted by changes.
-   - If available, review the last attempt and analyze test outputs if it failed.
+  - Examine relevant files in depth.
+  - Map out dependencies and interactions between components.
+  - Identify areas that may be impacted by changes.
+  - If available, review the last attempt and analyze test outputs if it failed.
 
 3. Solution Exploration
-   - Aim to make minimal changes to solve the problem efficiently.
-   - Consider multiple approaches to solve the problem.
-   - For each approach, document:
-     - Pros and cons
-     - Potential drawbacks
-     - Possible failure modes
-   - Think through edge cases and maintenance implications.
-   - Propose multiple solutions.
-   - If <IMPLEMENTATION_TRAILS> are available:
-     - Review existing trials
-     - Update their status based on the last attempt results
-     - Analyze what worked and what didn't
-     - Modify approaches based on your learnings
-   - Use the `track_implementation` tool within <PROPOSE_SOLUTIONS> to:
-     - Add new trials if necessary
-     - Update existing trials
-     - Include detailed notes.
-     - Update status appropriately
-   - Ensure comprehensive coverage of the solution space.
-   - If the current implementation fails multiple times:
-     - Document the failure in detail
-     - Try the next best solution approach
-     - Keep iterating until you find a working solution
-   - Never settle for partial success - all tests must pass.
+  - Aim to make minimal changes to solve the problem efficiently.
+  - Consider multiple approaches to solve the problem.
+  - For each approach, document:
+    - Pros and cons
+    - Potential drawbacks
+    - Possible failure modes
+  - Think through edge cases and maintenance implications.
+  - Propose multiple solutions.
+  - If <IMPLEMENTATION_TRAILS> are available:
+    - Review existing trials
+    - Update their status based on the last attempt results
+    - Analyze what worked and what didn't
+    - Modify approaches based on your learnings
+  - Use the `track_implementation` tool within <PROPOSE_SOLUTIONS> to:
+    - Add new trials if necessary
+    - Update existing trials
+    - Include detailed notes.
+    - Update status appropriately
+  - Ensure comprehensive coverage of the solution space.
+  - If the current implementation fails multiple times:
+    - Document the failure in detail
+    - Try the next best solution approach
+    - Keep iterating until you find a working solution
+  - Never settle for partial success - all tests must pass.
 
 4. Implementation Strategy
-   - Break down the changes into logical steps.
-   - Focus on minimal and precise modifications.
-   - Plan verification points throughout the implementation.
-   - Consider potential rollback scenarios.
-   - Choose the best solution that:
-     - Fully addresses the root cause of the issue
-     - Maintains existing functionalities
-     - Does not introduce regressions
-     - Prioritizes correctness and robustness over simplicity when necessary
+  - Break down the changes into logical steps.
+  - Focus on minimal and precise modifications.
+  - Plan verification points throughout the implementation.
+  - Consider potential rollback scenarios.
+  - Choose the best solution that:
+    - Fully addresses the root cause of the issue
+    - Maintains existing functionalities
+    - Does not introduce regressions
+    - Prioritizes correctness and robustness over simplicity when necessary
 
 Important Guidelines:
 - Base all reasoning on the provided workspace; avoid making assumptions.
@@ -133,7 +134,6 @@ Finally, list all actions within the `<EXECUTE_ACTIONS>` tag and await the resul
 Think deeply and proceed step-by-step through each stage of the process. Your thinking should be thorough, and it's fine if it's very long.
 """
 
-@observe()
 async def run_agent(thread_id: str, container_name: str, problem_file: str, threads_dir: str, max_iterations: int = 10, model_name: str = "sonnet"):
     agentops_session = agentops.start_session()
     
@@ -161,6 +161,10 @@ async def run_agent(thread_id: str, container_name: str, problem_file: str, thre
     }
     await thread_manager.add_to_history_only(thread_id, system_message)
 
+    # Only the workspace changes between iterations, so render the rest of the user prompt once
+    user_prompt_head, user_prompt_tail = user_prompt.split("{workspace}", 1)
+    user_prompt_tail = user_prompt_tail.format(problem_statement=problem_statement, xml_format=xml_format)
+
     iteration = 0
     reminder_custom_test = False
 
@@ -179,11 +183,7 @@ async def run_agent(thread_id: str, container_name: str, problem_file: str, thre
             
             await thread_manager.add_message(thread_id, {
                 "role": "user",
-                "content": user_prompt.format(
-                    problem_statement=problem_statement, 
-                    workspace=workspace,
-                    xml_format=xml_format,
-                )
+                "content": f"{user_prompt_head}{workspace}{user_prompt_tail}"
             })
 
             # Add continuation prompt for iterations after the first
@@ -233,6 +233,9 @@ async def run_agent(thread_id: str, container_name: str, problem_file: str, thre
 
     agentops_session.end_session()
 
+# Only trace the agent run when Langfuse is configured
+run_agent = observe()(run_agent) if os.environ.get('LANGFUSE_PUBLIC_KEY') else run_agent
+
 if __name__ == "__main__":
     async def main():
         parser = argparse.ArgumentParser()
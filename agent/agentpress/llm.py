@@ -6,6 +6,8 @@ import openai
 from openai import OpenAIError
 import asyncio
 import logging
+import random
+import hashlib
 from langfuse.decorators import langfuse_context, observe
 
 OPENAI_API_KEY = os.environ.get('OPENAI_API_KEY')
@@ -22,13 +24,106 @@ os.environ['LANGFUSE_PUBLIC_KEY'] = LANGFUSE_PUBLIC_KEY
 os.environ['LANGFUSE_SECRET_KEY'] = LANGFUSE_SECRET_KEY
 os.environ['LANGFUSE_HOST'] = LANGFUSE_HOST
 
-litellm.success_callback = ["langfuse"]
-litellm.failure_callback = ["langfuse"]
+if LANGFUSE_PUBLIC_KEY:
+    litellm.success_callback = ["langfuse"]
+    litellm.failure_callback = ["langfuse"]
+
+# Opt-in on-disk cache of non-streaming responses, e.g. for re-running an evaluation
+LLM_CACHE_DIR = os.environ.get('LLM_CACHE_DIR')
 
 os.environ['OPENAI_API_KEY'] = OPENAI_API_KEY
 os.environ['ANTHROPIC_API_KEY'] = ANTHROPIC_API_KEY
 os.environ['GROQ_API_KEY'] = GROQ_API_KEY
 
+def backoff_delay(attempt: int, base: float) -> float:
+    """
+    Compute an exponential backoff delay with jitter for a retry attempt.
+    
+    Args:
+        attempt (int): Zero-based index of the attempt that just failed
+        base (float): Base delay in seconds
+        
+    Returns:
+        float: Seconds to wait before the next attempt
+    """
+    return base * (2 ** attempt) + random.uniform(0, base)
+
+def retry_after_delay(error: Exception, attempt: int) -> float:
+    """
+    Determine how long to wait after a rate-limit error.
+    
+    Honors the provider's advertised retry hint (LiteLLM's `retry_after`
+    attribute or the `Retry-After` response header), clamped to [1, 60]
+    seconds, and falls back to exponential backoff when none is given.
+    
+    Args:
+        error (Exception): The rate-limit exception raised by litellm
+        attempt (int): Zero-based index of the attempt that just failed
+        
+    Returns:
+        float: Seconds to wait before the next attempt
+    """
+    retry_after = getattr(error, 'retry_after', None)
+    if retry_after is None:
+        response = getattr(error, 'response', None)
+        headers = getattr(response, 'headers', None)
+        if headers is not None:
+            retry_after = headers.get('retry-after')
+    try:
+        return min(max(float(retry_after), 1.0), 60.0)
+    except (TypeError, ValueError):
+        return backoff_delay(attempt, base=10)
+
+def response_cache_path(request: Dict[str, Any]) -> str:
+    """
+    Get the cache file path for an LLM request.
+    
+    Args:
+        request (Dict[str, Any]): Every parameter that affects the response
+        
+    Returns:
+        str: Path of the cache entry inside LLM_CACHE_DIR
+    """
+    payload = json.dumps(request, sort_keys=True, default=str)
+    key = hashlib.blake2b(payload.encode('utf-8'), digest_size=16).hexdigest()
+    return os.path.join(LLM_CACHE_DIR, f"{key}.json")
+
+def load_cached_response(cache_path: str) -> Any:
+    """
+    Load a cached LLM response.
+    
+    Args:
+        cache_path (str): Path of the cache entry
+        
+    Returns:
+        litellm.ModelResponse if the entry exists and is readable, None otherwise
+    """
+    try:
+        with open(cache_path, 'r') as f:
+            return litellm.ModelResponse(**json.load(f))
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logging.warning(f"Ignoring unreadable LLM cache entry {cache_path}: {e}")
+        return None
+
+def save_cached_response(cache_path: str, response: Any):
+    """
+    Store an LLM response in the cache.
+    
+    Args:
+        cache_path (str): Path of the cache entry
+        response (Any): Response returned by litellm
+    """
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        tmp_path = f"{cache_path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(response.model_dump(), f, default=str)
+        os.replace(tmp_path, cache_path)
+    except Exception as e:
+        logging.warning(f"Failed to write LLM cache entry {cache_path}: {e}")
+
 async def make_llm_api_call(
     messages: list, 
     model_name: str, 
@@ -73,6 +168,11 @@ async def make_llm_api_call(
     """
     litellm.set_verbose = True
 
+    # Provider checks are constant for the call, so compute them once rather than per retry
+    model_name_lower = model_name.lower()
+    is_anthropic = "claude" in model_name_lower or "anthropic" in model_name_lower
+    is_o1 = 'o1' in model_name
+
     async def attempt_api_call(api_call_func, max_attempts=3):
         """
         Attempt an API call with retries.
@@ -91,14 +191,17 @@ async def make_llm_api_call(
             try:
                 return await api_call_func()
             except litellm.exceptions.RateLimitError as e:
-                logging.warning(f"Rate limit exceeded. Waiting for 30 seconds before retrying...")
-                await asyncio.sleep(30)
+                delay = retry_after_delay(e, attempt)
+                logging.warning(f"Rate limit exceeded. Waiting for {delay:.1f} seconds before retrying...")
+                await asyncio.sleep(delay)
             except OpenAIError as e:
-                logging.info(f"API call failed, retrying attempt {attempt + 1}. Error: {e}")
-                await asyncio.sleep(5)
+                delay = backoff_delay(attempt, base=1)
+                logging.info(f"API call failed, retrying attempt {attempt + 1} in {delay:.1f} seconds. Error: {e}")
+                await asyncio.sleep(delay)
             except json.JSONDecodeError:
-                logging.error(f"JSON decoding failed, retrying attempt {attempt + 1}")
-                await asyncio.sleep(5)
+                delay = backoff_delay(attempt, base=1)
+                logging.error(f"JSON decoding failed, retrying attempt {attempt + 1} in {delay:.1f} seconds")
+                await asyncio.sleep(delay)
         raise Exception("Failed to make API call after multiple attempts.")
 
     async def api_call():
@@ -134,7 +237,7 @@ async def make_llm_api_call(
             api_call_params["api_base"] = api_base
 
         # Handle token limits differently for different models
-        if 'o1' in model_name:
+        if is_o1:
             if max_tokens is not None:
                 api_call_params["max_completion_tokens"] = max_tokens
         else:
@@ -147,8 +250,9 @@ async def make_llm_api_call(
 
         def add_cache_control_to_content(content):
             if isinstance(content, list):
+                # Content blocks are passed through so caller-placed cache breakpoints are kept
                 return [
-                    item if isinstance(item, dict) and "cache_control" in item 
+                    item if isinstance(item, dict)
                     else {"type": "text", "text": item, "cache_control": {"type": "ephemeral"}} 
                     for item in content
                 ]
@@ -158,7 +262,7 @@ async def make_llm_api_call(
                 return content
             return content
 
-        if "claude" in model_name.lower() or "anthropic" in model_name.lower():
+        if is_anthropic:
             api_call_params["extra_headers"] = {
                 "anthropic-beta": "max-tokens-3-5-sonnet-2024-07-15"
             }
@@ -166,7 +270,11 @@ async def make_llm_api_call(
             processed_messages = []
             for msg in messages:
                 processed_msg = msg.copy()
-                processed_msg["content"] = add_cache_control_to_content(msg["content"])
+                if msg["role"] == "system" and isinstance(msg["content"], str):
+                    # A static system prompt is the prefix worth caching across calls
+                    processed_msg["content"] = [{"type": "text", "text": msg["content"], "cache_control": {"type": "ephemeral"}}]
+                else:
+                    processed_msg["content"] = add_cache_control_to_content(msg["content"])
                 processed_messages.append(processed_msg)
             api_call_params["messages"] = processed_messages
         
@@ -184,7 +292,31 @@ async def make_llm_api_call(
 
         return response
 
-    return await attempt_api_call(api_call)
+    cache_path = None
+    if LLM_CACHE_DIR and not stream:
+        cache_path = response_cache_path({
+            "model": model_name,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            "tools": tools,
+            "tool_choice": tool_choice,
+            "top_p": top_p,
+            "stop_sequences": stop_sequences,
+            "response_format": response_format,
+            "api_base": api_base,
+        })
+        cached_response = load_cached_response(cache_path)
+        if cached_response is not None:
+            logging.info(f"Using cached LLM response {cache_path}")
+            return cached_response
+
+    response = await attempt_api_call(api_call)
+
+    if cache_path:
+        save_cached_response(cache_path, response)
+
+    return response
 
 if __name__ == "__main__":
     import asyncio
@@ -14,6 +14,11 @@ class StateManager:
     concurrent access using asyncio locks and provides atomic operations for
     state modifications.
     
+    The parsed store is cached in-process and only re-read from disk when
+    the file's modification time or size changes. Values are handed out as
+    copies parsed from their cached JSON text, so a read neither re-parses
+    the whole file nor deep-copies the value.
+    
     Attributes:
         lock (Lock): Asyncio lock for thread-safe state access
         store_file (str): Path to the JSON file storing the state
@@ -29,8 +34,50 @@ class StateManager:
         """
         self.lock = Lock()
         self.store_file = store_file
+        self._store = {}
+        self._signature = None
+        self._texts = {}
         logging.info(f"StateManager initialized with store file: {store_file}")
 
+    def _file_signature(self):
+        """Return the (mtime, size) signature of the store file, or None if missing."""
+        try:
+            stat = os.stat(self.store_file)
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _refresh_cache(self):
+        """Re-read the store file if its signature changed since it was last read or written."""
+        signature = self._file_signature()
+        if signature is None:
+            self._store, self._signature, self._texts = {}, None, {}
+        elif signature != self._signature:
+            with open(self.store_file, 'r') as f:
+                self._store = json.load(f)
+            self._signature = signature
+            self._texts = {}
+
+    def _load_store(self) -> dict:
+        """
+        Load the state store, reusing the cached copy if the file is unchanged.
+        
+        Returns:
+            dict: A shallow copy of the store contents, safe to add and remove keys in
+        """
+        self._refresh_cache()
+        return dict(self._store)
+
+    def _save_store(self, store: dict):
+        """Write the state store to disk and make it the cached store."""
+        with open(self.store_file, 'w') as f:
+            json.dump(store, f, indent=2)
+        previous = self._store
+        self._store = store
+        self._signature = self._file_signature()
+        # Cached JSON text stays valid for values that were not replaced
+        self._texts = {key: text for key, text in self._texts.items() if key in store and store[key] is previous.get(key)}
+
     @asynccontextmanager
     async def store_scope(self):
         """
@@ -48,17 +95,12 @@ class StateManager:
         """
         try:
             # Read current state
-            if os.path.exists(self.store_file):
-                with open(self.store_file, 'r') as f:
-                    store = json.load(f)
-            else:
-                store = {}
+            store = self._load_store()
             
             yield store
             
             # Write updated state
-            with open(self.store_file, 'w') as f:
-                json.dump(store, f, indent=2)
+            self._save_store(store)
             logging.debug("Store saved successfully")
         except Exception as e:
             logging.error("Error in store operation", exc_info=True)
@@ -81,12 +123,15 @@ class StateManager:
         async with self.lock:
             async with self.store_scope() as store:
                 try:
-                    store[key] = data  # Will be JSON serialized when written to file
+                    # Serialize now so later changes to the caller's object are not stored
+                    text = json.dumps(data)
+                    store[key] = json.loads(text)
                     logging.info(f'Updated store key: {key}')
-                    return data
                 except Exception as e:
                     logging.error(f'Error in set: {str(e)}')
                     raise
+            self._texts[key] = text
+            return data
 
     async def get(self, key: str) -> Any:
         """
@@ -96,18 +141,21 @@ class StateManager:
             key (str): Simple string key like "config" or "settings"
             
         Returns:
-            Any: The stored data for the key, or None if key not found
+            Any: A copy of the stored data for the key, or None if key not found
             
         Note:
             This operation is read-only and doesn't require locking
         """
-        async with self.store_scope() as store:
-            if key in store:
-                data = store[key]
-                logging.info(f'Retrieved key: {key}')
-                return data
-            logging.info(f'Key not found: {key}')
-            return None
+        self._refresh_cache()
+        if key in self._store:
+            text = self._texts.get(key)
+            if text is None:
+                text = self._texts[key] = json.dumps(self._store[key])
+            data = json.loads(text)
+            logging.info(f'Retrieved key: {key}')
+            return data
+        logging.info(f'Key not found: {key}')
+        return None
 
     async def delete(self, key: str):
         """
@@ -137,9 +185,10 @@ class StateManager:
         Note:
             This operation is read-only and returns a copy of the store
         """
-        async with self.store_scope() as store:
-            logging.info(f"Store content: {store}")
-            return store
+        self._refresh_cache()
+        store = json.loads(json.dumps(self._store))
+        logging.info(f"Store content: {store}")
+        return store
 
     async def clear_store(self):
         """
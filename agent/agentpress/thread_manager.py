@@ -43,6 +43,7 @@ class ThreadManager:
         add_tool: Register a tool with optional function filtering
         create_thread: Create a new conversation thread
         add_message: Add a message to a thread
+        add_messages: Add several messages to a thread in one write
         list_messages: Retrieve messages from a thread
         run_thread: Execute a conversation thread with LLM
     """
@@ -75,6 +76,10 @@ class ThreadManager:
         """
         self.tool_registry.register_tool(tool_class, function_names, **kwargs)
 
+    async def close_tools(self):
+        """Close all registered tools, e.g. their container sessions, at the end of a run."""
+        await self.tool_registry.close_tools()
+
     async def create_thread(self) -> str:
         """Create a new conversation thread.
         
@@ -119,6 +124,42 @@ class ThreadManager:
             - Converts ToolResult instances to strings
         """
         logging.info(f"Adding message to thread {thread_id} with images: {images}")
+
+        # Handle image attachments
+        if images:
+            if isinstance(message_data['content'], str):
+                message_data['content'] = [{"type": "text", "text": message_data['content']}]
+            elif not isinstance(message_data['content'], list):
+                message_data['content'] = []
+
+            for image in images:
+                image_content = {
+                    "type": "image_url",
+                    "image_url": {
+                        "url": f"data:{image['content_type']};base64,{image['base64']}",
+                        "detail": "high"
+                    }
+                }
+                message_data['content'].append(image_content)
+
+        await self.add_messages(thread_id, [message_data])
+
+    async def add_messages(self, thread_id: str, messages_data: List[Dict[str, Any]]):
+        """Add several messages to an existing thread with a single write.
+        
+        Args:
+            thread_id: ID of the target thread
+            messages_data: Messages to append, in order
+            
+        Raises:
+            FileNotFoundError: If thread doesn't exist
+            Exception: For other operation failures
+            
+        Notes:
+            - The thread and history files are each written once per call
+            - Handles cleanup of incomplete tool calls before user messages
+            - Converts ToolResult instances to strings
+        """
         thread_path = os.path.join(self.threads_dir, f"{thread_id}.json")
         history_path = os.path.join(self.threads_dir, f"{thread_id}_history.json")
         
@@ -128,42 +169,18 @@ class ThreadManager:
             
             messages = thread_data["messages"]
             
-            # Handle cleanup of incomplete tool calls
-            if message_data['role'] == 'user':
-                last_assistant_index = next((i for i in reversed(range(len(messages))) 
-                    if messages[i]['role'] == 'assistant' and 'tool_calls' in messages[i]), None)
-                
-                if last_assistant_index is not None:
-                    tool_call_count = len(messages[last_assistant_index]['tool_calls'])
-                    tool_response_count = sum(1 for msg in messages[last_assistant_index+1:] 
-                                           if msg['role'] == 'tool')
-                    
-                    if tool_call_count != tool_response_count:
-                        await self.cleanup_incomplete_tool_calls(thread_id)
-
-            # Convert ToolResult instances to strings
-            for key, value in message_data.items():
-                if isinstance(value, ToolResult):
-                    message_data[key] = str(value)
+            for message_data in messages_data:
+                # Handle cleanup of incomplete tool calls
+                if message_data['role'] == 'user':
+                    self._fill_incomplete_tool_calls(messages)
 
-            # Handle image attachments
-            if images:
-                if isinstance(message_data['content'], str):
-                    message_data['content'] = [{"type": "text", "text": message_data['content']}]
-                elif not isinstance(message_data['content'], list):
-                    message_data['content'] = []
-
-                for image in images:
-                    image_content = {
-                        "type": "image_url",
-                        "image_url": {
-                            "url": f"data:{image['content_type']};base64,{image['base64']}",
-                            "detail": "high"
-                        }
-                    }
-                    message_data['content'].append(image_content)
+                # Convert ToolResult instances to strings
+                for key, value in message_data.items():
+                    if isinstance(value, ToolResult):
+                        message_data[key] = str(value)
+
+                messages.append(message_data)
 
-            messages.append(message_data)
             thread_data["messages"] = messages
             
             with open(thread_path, 'w') as f:
@@ -175,13 +192,13 @@ class ThreadManager:
                     history_data = json.load(f)
             except FileNotFoundError:
                 history_data = {"messages": []}
-            history_data["messages"].append(message_data)
+            history_data["messages"].extend(messages_data)
             with open(history_path, 'w') as f:
                 json.dump(history_data, f)
             
-            logging.info(f"Message added to thread {thread_id} and history: {message_data}")
+            logging.info(f"Messages added to thread {thread_id} and history: {messages_data}")
         except Exception as e:
-            logging.error(f"Failed to add message to thread {thread_id}: {e}")
+            logging.error(f"Failed to add messages to thread {thread_id}: {e}")
             raise e
 
     async def list_messages(
@@ -252,34 +269,48 @@ class ThreadManager:
             - Maintains thread consistency after interruptions
         """
         messages = await self.list_messages(thread_id)
-        last_assistant_message = next((m for m in reversed(messages) 
-            if m['role'] == 'assistant' and 'tool_calls' in m), None)
-
-        if last_assistant_message:
-            tool_calls = last_assistant_message.get('tool_calls', [])
-            tool_responses = [m for m in messages[messages.index(last_assistant_message)+1:] 
-                            if m['role'] == 'tool']
-
-            if len(tool_calls) != len(tool_responses):
-                failed_tool_results = []
-                for tool_call in tool_calls[len(tool_responses):]:
-                    failed_tool_result = {
-                        "role": "tool",
-                        "tool_call_id": tool_call['id'],
-                        "name": tool_call['function']['name'],
-                        "content": "ToolResult(success=False, output='Execution interrupted. Session was stopped.')"
-                    }
-                    failed_tool_results.append(failed_tool_result)
+        if self._fill_incomplete_tool_calls(messages):
+            thread_path = os.path.join(self.threads_dir, f"{thread_id}.json")
+            with open(thread_path, 'w') as f:
+                json.dump({"messages": messages}, f)
+            return True
+        return False
 
-                assistant_index = messages.index(last_assistant_message)
-                messages[assistant_index+1:assistant_index+1] = failed_tool_results
+    @staticmethod
+    def _fill_incomplete_tool_calls(messages: List[Dict[str, Any]]) -> bool:
+        """Insert failure results for unanswered tool calls, in place.
 
-                thread_path = os.path.join(self.threads_dir, f"{thread_id}.json")
-                with open(thread_path, 'w') as f:
-                    json.dump({"messages": messages}, f)
+        Args:
+            messages: Thread messages to repair
 
-                return True
-        return False
+        Returns:
+            bool: True if failure results were inserted, False otherwise
+        """
+        last_assistant_index = next((i for i in reversed(range(len(messages)))
+            if messages[i]['role'] == 'assistant' and 'tool_calls' in messages[i]), None)
+
+        if last_assistant_index is None:
+            return False
+
+        tool_calls = messages[last_assistant_index].get('tool_calls', [])
+        tool_response_count = sum(1 for m in messages[last_assistant_index+1:]
+                                  if m['role'] == 'tool')
+
+        if len(tool_calls) == tool_response_count:
+            return False
+
+        failed_tool_results = []
+        for tool_call in tool_calls[tool_response_count:]:
+            failed_tool_result = {
+                "role": "tool",
+                "tool_call_id": tool_call['id'],
+                "name": tool_call['function']['name'],
+                "content": "ToolResult(success=False, output='Execution interrupted. Session was stopped.')"
+            }
+            failed_tool_results.append(failed_tool_result)
+
+        messages[last_assistant_index+1:last_assistant_index+1] = failed_tool_results
+        return True
 
     async def run_thread(
         self,
@@ -101,6 +101,7 @@ class Tool(ABC):
         
     Methods:
         get_schemas: Get all registered tool schemas
+        close: Release resources held by the tool
         success_response: Create a successful result
         fail_response: Create a failed result
     """
@@ -112,9 +113,10 @@ class Tool(ABC):
 
     def _register_schemas(self):
         """Register schemas from all decorated methods."""
-        for name, method in inspect.getmembers(self, predicate=inspect.ismethod):
-            if hasattr(method, 'tool_schemas'):
-                self._schemas[name] = method.tool_schemas
+        # Inspect the class so that properties are not evaluated during registration
+        for name, func in inspect.getmembers(type(self), predicate=inspect.isfunction):
+            if hasattr(func, 'tool_schemas'):
+                self._schemas[name] = func.tool_schemas
 
     def get_schemas(self) -> Dict[str, List[ToolSchema]]:
         """Get all registered tool schemas.
@@ -124,6 +126,12 @@ class Tool(ABC):
         """
         return self._schemas
 
+    async def close(self):
+        """Release resources held by the tool, e.g. container sessions.
+        
+        The default does nothing; tools holding resources override it.
+        """
+
     def success_response(self, data: Union[Dict[str, Any], str]) -> ToolResult:
         """Create a successful tool result.
         
@@ -1,3 +1,5 @@
+import asyncio
+import inspect
 from typing import Dict, Type, Any, List, Optional, Callable
 from agentpress.tool import Tool, SchemaType, ToolSchema
 import logging
@@ -19,6 +21,7 @@ class ToolRegistry:
         get_xml_tool: Get a tool by XML tag name
         get_openapi_schemas: Get OpenAPI schemas for function calling
         get_xml_examples: Get examples of XML tool usage
+        close_tools: Release resources held by registered tools
     """
     
     _instance = None
@@ -63,10 +66,29 @@ class ToolRegistry:
                         self.xml_tools[schema.xml_schema.tag_name] = {
                             "instance": tool_instance,
                             "method": func_name,
-                            "schema": schema
+                            "schema": schema,
+                            "required_params": self._required_xml_params(tool_instance, func_name, schema)
                         }
                         logging.info(f"Registered XML tag {schema.xml_schema.tag_name} -> {func_name}")
 
+    @staticmethod
+    def _required_xml_params(tool_instance: Tool, func_name: str, schema: ToolSchema) -> frozenset:
+        """Get the mapped parameters an XML tool call must provide.
+        
+        Args:
+            tool_instance: The tool instance
+            func_name: Name of the tool method
+            schema: XML schema of the method
+            
+        Returns:
+            Names of mapped parameters without a default value in the method
+        """
+        method_params = inspect.signature(getattr(tool_instance, func_name)).parameters
+        return frozenset(
+            mapping.param_name for mapping in schema.xml_schema.mappings
+            if getattr(method_params.get(mapping.param_name), 'default', inspect.Parameter.empty) is inspect.Parameter.empty
+        )
+
     def get_available_functions(self) -> Dict[str, Callable]:
         """Get all available tool functions.
         
@@ -99,7 +121,7 @@ class ToolRegistry:
             tag_name: XML tag name for the tool
             
         Returns:
-            Dict containing tool instance, method name, and schema
+            Dict containing tool instance, method name, schema and required parameter names
         """
         return self.xml_tools.get(tag_name, {})
 
@@ -127,3 +149,13 @@ class ToolRegistry:
             if schema.xml_schema and schema.xml_schema.example:
                 examples[schema.xml_schema.tag_name] = schema.xml_schema.example
         return examples
+
+    async def close_tools(self):
+        """Close every registered tool instance once.
+        
+        A tool registered under several functions or tags is closed once.
+        """
+        instances = {}
+        for tool_info in list(self.tools.values()) + list(self.xml_tools.values()):
+            instances[id(tool_info['instance'])] = tool_info['instance']
+        await asyncio.gather(*(instance.close() for instance in instances.values()))
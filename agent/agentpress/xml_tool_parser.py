@@ -11,8 +11,28 @@ from agentpress.base_processors import ToolParserBase
 import json
 import xml.etree.ElementTree as ET
 import re
+from functools import lru_cache
 from xml.sax.saxutils import escape
 from agentpress.tool_registry import ToolRegistry
+
+# Name of the opening tag at the start of an XML chunk
+TAG_NAME_PATTERN = re.compile(r'<([^\s>]+)')
+
+@lru_cache(maxsize=None)
+def _attribute_patterns(attr_name: str) -> Tuple[re.Pattern, ...]:
+    """Compile the attribute patterns for one attribute name, once per name.
+    
+    Args:
+        attr_name: Name of the attribute to find
+        
+    Returns:
+        Tuple[re.Pattern, ...]: Patterns for double-quoted, single-quoted and unquoted values
+    """
+    return (
+        re.compile(fr'{attr_name}="([^"]*)"'),  # Double quotes
+        re.compile(fr"{attr_name}='([^']*)'"),  # Single quotes
+        re.compile(fr'{attr_name}=([^\s/>;]+)')  # No quotes - fixed escape sequence
+    )
  
 class XMLToolParser(ToolParserBase):
     """XML-specific implementation for parsing tool calls from LLM responses.
@@ -112,15 +132,9 @@ class XMLToolParser(ToolParserBase):
             - Unescapes XML entities in attribute values
         """
         try:
-            # Handle both single and double quotes with raw strings
-            patterns = [
-                fr'{attr_name}="([^"]*)"',  # Double quotes
-                fr"{attr_name}='([^']*)'",  # Single quotes
-                fr'{attr_name}=([^\s/>;]+)'  # No quotes - fixed escape sequence
-            ]
-            
-            for pattern in patterns:
-                match = re.search(pattern, opening_tag)
+            # Handle both single and double quotes
+            for pattern in _attribute_patterns(attr_name):
+                match = pattern.search(opening_tag)
                 if match:
                     value = match.group(1)
                     # Unescape common XML entities
@@ -236,7 +250,7 @@ class XMLToolParser(ToolParserBase):
         """
         try:
             # Extract tag name and validate
-            tag_match = re.match(r'<([^\s>]+)', xml_chunk)
+            tag_match = TAG_NAME_PATTERN.match(xml_chunk)
             if not tag_match:
                 logging.error(f"No tag found in XML chunk: {xml_chunk}")
                 return None
@@ -295,7 +309,11 @@ class XMLToolParser(ToolParserBase):
                     logging.error(f"Error processing mapping {mapping}: {e}")
                     continue
             
-            missing = [mapping.param_name for mapping in schema.mappings if mapping.param_name not in params]
+            # Parameters with a default value in the tool method may be omitted
+            missing = [
+                mapping.param_name for mapping in schema.mappings
+                if mapping.param_name not in params and mapping.param_name in tool_info['required_params']
+            ]
             if missing:
                 logging.error(f"Missing required parameters: {missing}")
                 logging.error(f"Current params: {params}")
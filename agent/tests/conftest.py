@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Modules under agent/ import each other as top-level packages (tools.*, agentpress.*)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
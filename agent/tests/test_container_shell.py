@@ -0,0 +1,72 @@
+import asyncio
+
+import pytest
+
+from tools.container_shell import ContainerShell
+
+MARKER = b'\n0123abcd:'
+
+
+def read_until(chunks, max_bytes=None, eof=False):
+    """Feed chunks to a StreamReader one at a time while _read_until consumes it."""
+    async def run():
+        stream = asyncio.StreamReader()
+        reader = asyncio.ensure_future(ContainerShell._read_until(stream, MARKER, max_bytes))
+        for chunk in chunks:
+            stream.feed_data(chunk)
+            await asyncio.sleep(0)
+        if eof:
+            stream.feed_eof()
+        return await reader
+    return asyncio.run(run())
+
+
+def test_returns_output_and_status():
+    assert read_until([b'hello\nworld' + MARKER + b'0\n']) == (b'hello\nworld', b'0')
+
+
+def test_empty_output():
+    assert read_until([MARKER + b'127\n']) == (b'', b'127')
+
+
+def test_sentinel_split_across_chunks():
+    chunks = [b'out', MARKER[:4], MARKER[4:], b'1', b'2\n']
+    assert read_until(chunks) == (b'out', b'12')
+
+
+def test_sentinel_without_status_line_waits_for_newline():
+    assert read_until([b'x' + MARKER, b'0', b'\n']) == (b'x', b'0')
+
+
+def test_no_limit_keeps_everything():
+    output = b'y' * 200000
+    assert read_until([output[:70000], output[70000:] + MARKER + b'0\n']) == (output, b'0')
+
+
+def test_truncates_middle_keeping_head_and_tail():
+    chunks = [b'a' * 5, b'b' * 60, b'b' * 40, b'c' * 5 + MARKER + b'0\n']
+    output, status = read_until(chunks, max_bytes=10)
+    assert output == b'aaaaa\n... <100 bytes elided> ...\nccccc'
+    assert status == b'0'
+
+
+def test_truncates_output_read_in_one_chunk():
+    output, _ = read_until([b'a' * 5 + b'b' * 100 + b'c' * 5 + MARKER + b'0\n'], max_bytes=10)
+    assert output == b'aaaaa\n... <100 bytes elided> ...\nccccc'
+
+
+def test_output_within_limit_is_not_truncated():
+    assert read_until([b'a' * 4, b'b' * 6 + MARKER + b'0\n'], max_bytes=10) == (b'aaaabbbbbb', b'0')
+
+
+def test_sentinel_not_lost_while_truncating():
+    # The marker straddles chunks that are already being elided
+    chunks = [b'z' * 50 + MARKER[:3], MARKER[3:] + b'0\n']
+    output, status = read_until(chunks, max_bytes=10)
+    assert status == b'0'
+    assert output == b'zzzzz\n... <40 bytes elided> ...\nzzzzz'
+
+
+def test_eof_before_sentinel_raises():
+    with pytest.raises(ConnectionError):
+        read_until([b'partial output'], eof=True)
@@ -1,54 +1,73 @@
 # agent/tools/bash_tool.py
 
 import asyncio
+from typing import List, Union
 from agentpress.tool import Tool, ToolResult, openapi_schema, xml_schema
 from agentpress.state_manager import StateManager
+from tools.container_shell import ContainerShell
 
 class BashTool(Tool):
+    # Sessions used by bash_commands, i.e. the most commands run at once
+    MAX_PARALLEL_COMMANDS = 4
+    # Per-command timeout in seconds, and the most a command may ask for
+    DEFAULT_TIMEOUT = 120
+    MAX_TIMEOUT = 600
+
     def __init__(self, container_name: str, state_file: str):
         super().__init__()
         self.container_name = container_name
-        self.state_manager = StateManager(store_file=state_file)
+        self._state_file = state_file
+        self._state_manager = None
         self.environment_setup = (
             f'. /opt/miniconda3/etc/profile.d/conda.sh && '
             f'conda activate testbed && '
             f'cd /testbed && '
             f'git config --global --add safe.directory /testbed && '
             f'git config --global core.pager cat && '
+            f'set -o pipefail'
         )
+        # One shell per tool, set up once and reused by every command
+        self.shell = ContainerShell(container_name, setup_command=self.environment_setup)
+        # Sessions used by bash_commands; extra ones are only created when a batch needs them
+        self.parallel_shells = [self.shell]
+
+    @property
+    def state_manager(self) -> StateManager:
+        """State store for this tool, created on first access since commands never use it."""
+        if self._state_manager is None:
+            self._state_manager = StateManager(store_file=self._state_file)
+        return self._state_manager
+
+    def _get_parallel_shells(self, count: int) -> List[ContainerShell]:
+        """Return up to count sessions for bash_commands, creating missing ones."""
+        count = min(count, self.MAX_PARALLEL_COMMANDS)
+        while len(self.parallel_shells) < count:
+            self.parallel_shells.append(ContainerShell(self.container_name, setup_command=self.environment_setup))
+        return self.parallel_shells[:count]
 
-    async def execute_command_in_container(self, command: str):
+    async def close(self):
+        """Terminate every container session opened by this tool."""
+        await asyncio.gather(*(shell.close() for shell in self.parallel_shells))
+
+    async def execute_command_in_container(self, command: str, shell: ContainerShell = None, timeout: int = DEFAULT_TIMEOUT):
         """
         Executes a given bash command inside the specified Docker container.
 
         Parameters:
             command (str): The bash command to execute.
+            shell (ContainerShell, optional): Session to run it in. Defaults to self.shell.
+            timeout (int): Seconds to wait for the command to finish.
 
         Returns:
             tuple: (stdout, stderr, returncode)
         """
-        full_command = (
-            f'{self.environment_setup}'
-            f'set -o pipefail && '
-            f'{command}'
-        )
-        cmd = [
-            'docker', 'exec',
-            '-i',  # Interactive mode
-            self.container_name,
-            '/bin/bash', '-c', full_command
-        ]
-        process = await asyncio.create_subprocess_exec(
-            *cmd,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE
-        )
         try:
-            stdout, stderr = await asyncio.wait_for(process.communicate(), timeout=120)  # 5 minutes timeout
+            return await (shell or self.shell).run(command, timeout=timeout)
         except asyncio.TimeoutError:
-            process.kill()
-            return '', 'Command execution timed out after 5 minutes', 1
-        return stdout.decode(), stderr.decode(), process.returncode
+            return '', (
+                f'Command timed out after {timeout} seconds. Narrow the command (e.g. run a single test file) '
+                f'or pass a larger timeout (at most {self.MAX_TIMEOUT} seconds).'
+            ), 1
 
     @openapi_schema({
         "type": "function",
@@ -67,6 +86,10 @@ class BashTool(Tool):
                     "command": {
                         "type": "string",
                         "description": "The bash command to execute."
+                    },
+                    "timeout": {
+                        "type": "integer",
+                        "description": "Seconds to wait for the command to finish (default 120, max 600). Raise it for long test runs."
                     }
                 },
                 "required": ["command"]
@@ -76,7 +99,8 @@ class BashTool(Tool):
     @xml_schema(
         tag_name="bash-command",
         mappings=[
-            {"param_name": "command", "node_type": "content", "path": "."}
+            {"param_name": "command", "node_type": "content", "path": "."},
+            {"param_name": "timeout", "node_type": "attribute", "path": "timeout"}
         ],
         example='''
         <!-- Bash Command Tool -->
@@ -85,13 +109,14 @@ class BashTool(Tool):
         <!-- Parameters Description:
              - command: The bash command to execute (REQUIRED)
                       Content goes between the tags
+             - timeout: Seconds to wait for the command to finish (optional, default 120, max 600)
         -->
 
         <!-- Execute a simple command -->
         <bash-command>ls -la</bash-command>
 
-        <!-- Run tests with filtered output -->
-        <bash-command>python -m pytest test_file.py | grep -A 5 "FAILED"</bash-command>
+        <!-- Run tests with filtered output, allowing a longer run -->
+        <bash-command timeout="300">python -m pytest test_file.py | grep -A 5 "FAILED"</bash-command>
 
         <!-- Build and run the project -->
         <bash-command>make build && ./run_tests.sh</bash-command>
@@ -106,15 +131,89 @@ class BashTool(Tool):
         -->
         '''
     )
-    async def bash_command(self, command: str) -> ToolResult:
+    async def bash_command(self, command: str, timeout: int = DEFAULT_TIMEOUT) -> ToolResult:
+        return await self._run_bash_command(command, self.shell, timeout)
+
+    async def _run_bash_command(self, command: str, shell: ContainerShell, timeout: int = DEFAULT_TIMEOUT) -> ToolResult:
         try:
-            stdout, stderr, returncode = await self.execute_command_in_container(command)
+            # XML attributes arrive as strings
+            timeout = min(max(int(timeout), 1), self.MAX_TIMEOUT)
+            stdout, stderr, returncode = await self.execute_command_in_container(command, shell, timeout)
+            # Strip each stream once; outputs can be up to ContainerShell.MAX_OUTPUT_BYTES
+            stdout = stdout.strip()
             output = f"\nCommand executed: `{command}`\n"
             if returncode == 0:
-                output += f"<output>{stdout.strip() if stdout.strip() else 'No output.'}</output>"
+                output += f"<output>{stdout or 'No output.'}</output>"
                 return self.success_response(output)
             else:
-                output += f"<output>{stdout.strip()}\n{stderr.strip()}</output>"
+                output += f"<output>{stdout}\n{stderr.strip()}</output>"
                 return self.fail_response(output)
         except Exception as e:
             return self.fail_response(f"Command executed: `{command}`\nError executing bash command: {str(e)}")
+
+    @openapi_schema({
+        "type": "function",
+        "function": {
+            "name": "bash_commands",
+            "description": (
+                "Execute several independent, read-only bash commands concurrently and return all their outputs.\n"
+                "**Notes:**\n"
+                "- Use it to batch exploration such as `grep`, `find`, `cat`, `git log` or `pytest --collect-only`.\n"
+                "- Commands run in parallel and in separate shells, so NEVER use it for commands that modify files "
+                "or the environment, or that depend on each other; use bash_command for those.\n"
+                "- The working directory is `/testbed` and the environment is set up with `conda activate testbed`.\n"
+            ),
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "commands": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "The bash commands to execute."
+                    }
+                },
+                "required": ["commands"]
+            }
+        }
+    })
+    @xml_schema(
+        tag_name="parallel-bash",
+        mappings=[
+            {"param_name": "commands", "node_type": "content", "path": "."}
+        ],
+        example='''
+        <!-- Bash Commands Tool -->
+        <!-- Execute several independent, read-only bash commands concurrently -->
+        
+        <!-- Parameters Description:
+             - commands: The bash commands to execute, one per line (REQUIRED)
+                       Content goes between the tags
+        -->
+
+        <parallel-bash>
+        grep -rn "def parse" src/
+        git log --oneline -5
+        python -m pytest tests/test_parser.py --collect-only -q
+        </parallel-bash>
+
+        <!-- Important Notes:
+        - Commands run in parallel and in separate shells: NEVER use this for commands that modify files
+          or the environment, or that depend on each other; use bash-command for those
+        -->
+        '''
+    )
+    async def bash_commands(self, commands: Union[List[str], str]) -> ToolResult:
+        if isinstance(commands, str):
+            commands = [line.strip() for line in commands.splitlines() if line.strip()]
+        if not commands:
+            return self.fail_response("No commands given.")
+        shells = self._get_parallel_shells(len(commands))
+        # Commands sharing a session queue on its lock, so at most len(shells) run at once
+        results = await asyncio.gather(*(
+            self._run_bash_command(command, shells[i % len(shells)])
+            for i, command in enumerate(commands)
+        ))
+        output = "\n".join(result.output for result in results)
+        if all(result.success for result in results):
+            return self.success_response(output)
+        return self.fail_response(output)
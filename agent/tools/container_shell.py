@@ -0,0 +1,214 @@
+# agent/tools/container_shell.py
+
+import asyncio
+import base64
+import uuid
+from typing import Optional, Tuple
+
+class ContainerShell:
+    """
+    A persistent bash session inside a Docker container.
+
+    A single `docker exec -i <container> /bin/bash` process is started on first
+    use and reused for every command, so the docker CLI start-up and the
+    environment setup are paid once per session instead of once per command.
+    Each command runs in a subshell with stdin from /dev/null, so `cd`, `set`
+    or `exit` in one command do not leak into the next, and its completion is
+    detected by a per-command sentinel line carrying the exit status. Job
+    control is on in the session, so each subshell leads its own process
+    group; if a command times out, that group is killed inside the container
+    before the session is discarded, instead of being left running there.
+
+    Output beyond max_output_bytes per stream is elided from the middle while
+    it is read, keeping the head and the tail, so a runaway command cannot
+    exhaust memory and the caller never decodes more than the cap.
+
+    Attributes:
+        container_name (str): Name of the Docker container
+        setup_command (str): Command run once in the session shell when it starts
+        max_output_bytes (int, optional): Bytes kept per stream, or None for no limit
+    """
+
+    MAX_OUTPUT_BYTES = 131072
+    # Seconds to wait for the docker exec that kills a timed-out command
+    KILL_TIMEOUT = 10
+
+    def __init__(self, container_name: str, setup_command: str = '', max_output_bytes: Optional[int] = MAX_OUTPUT_BYTES):
+        self.container_name = container_name
+        self.setup_command = setup_command
+        self.max_output_bytes = max_output_bytes
+        self._process = None
+        self._lock = asyncio.Lock()
+        # Holds the process group id of the running command, inside the container
+        self._pid_file = f'/tmp/container_shell_{uuid.uuid4().hex}.pid'
+
+    async def run(self, command: str, timeout: Optional[float] = 120) -> Tuple[str, str, int]:
+        """
+        Run a command in the session, starting the session if needed.
+
+        Args:
+            command (str): The bash command to execute
+            timeout (float, optional): Seconds to wait for the command to finish, or None to wait indefinitely
+
+        Returns:
+            tuple: (stdout, stderr, returncode)
+
+        Raises:
+            asyncio.TimeoutError: If the command does not finish in time. The
+                command is killed, the session is discarded and a new one is
+                started on next use.
+        """
+        async with self._lock:
+            try:
+                if self._process is None or self._process.returncode is not None:
+                    await self._start(timeout)
+                return await asyncio.wait_for(self._run(command, subshell=True), timeout)
+            except BaseException:
+                # The output streams are out of sync with the command, so the session cannot be reused
+                await self._kill_command()
+                await self._close()
+                raise
+
+    async def close(self):
+        """Terminate the session shell, if one is running."""
+        async with self._lock:
+            await self._close()
+
+    async def _start(self, timeout: Optional[float]):
+        """Start the session shell and run the setup command in it."""
+        self._process = await asyncio.create_subprocess_exec(
+            'docker', 'exec',
+            '-i',  # Keep stdin open to feed commands
+            self.container_name,
+            '/bin/bash', '--noprofile', '--norc',
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+        # Job control puts every background job, i.e. every command, in its own process group
+        self._process.stdin.write(b'set -m\n')
+        if self.setup_command:
+            # Run in the session shell itself so activation and working directory persist
+            _, stderr, returncode = await asyncio.wait_for(self._run(self.setup_command, subshell=False), timeout)
+            if returncode != 0:
+                raise RuntimeError(f"Shell setup failed in container {self.container_name}: {stderr.strip()}")
+
+    async def _kill_command(self):
+        """Kill the running command's process group, which outlives the docker exec client."""
+        if self._process is None:
+            return
+        process = await asyncio.create_subprocess_exec(
+            'docker', 'exec', self.container_name,
+            '/bin/sh', '-c', f'pgid=$(cat {self._pid_file} 2>/dev/null) && [ -n "$pgid" ] && kill -s KILL -- "-$pgid"',
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.DEVNULL
+        )
+        try:
+            await asyncio.wait_for(process.wait(), self.KILL_TIMEOUT)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+
+    async def _close(self):
+        process, self._process = self._process, None
+        if process is not None and process.returncode is None:
+            process.kill()
+            await process.wait()
+
+    async def _run(self, command: str, subshell: bool) -> Tuple[str, str, int]:
+        """
+        Send a command to the session shell and collect its output.
+
+        The command is passed base64-encoded to `eval`, so quoting or syntax
+        errors in it fail that command only instead of desynchronizing the shell.
+        A subshell runs as a background job whose process group id is written
+        to the session's pid file while it runs, so _kill_command can find it.
+
+        Args:
+            command (str): The bash command to execute
+            subshell (bool): Whether to isolate the command in a subshell
+
+        Returns:
+            tuple: (stdout, stderr, returncode)
+        """
+        token = uuid.uuid4().hex
+        encoded = base64.b64encode(command.encode('utf-8')).decode('ascii')
+        body = f'eval "$(echo {encoded} | base64 -d)"'
+        if subshell:
+            script = (
+                f'( {body} ) < /dev/null &\n'
+                f'echo $! > {self._pid_file}\n'
+                f'wait $!\n'
+                f'__shell_rc=$?\n'
+                f': > {self._pid_file}\n'
+            )
+        else:
+            script = f'{body} < /dev/null\n__shell_rc=$?\n'
+        script += (
+            f'printf "\\n{token}:%s\\n" "$__shell_rc"\n'
+            f'printf "\\n{token}:%s\\n" "$__shell_rc" >&2\n'
+        )
+        self._process.stdin.write(script.encode('utf-8'))
+        await self._process.stdin.drain()
+
+        marker = f'\n{token}:'.encode('ascii')
+        (stdout, returncode), (stderr, _) = await asyncio.gather(
+            self._read_until(self._process.stdout, marker, self.max_output_bytes),
+            self._read_until(self._process.stderr, marker, self.max_output_bytes)
+        )
+        return stdout.decode('utf-8', errors='replace'), stderr.decode('utf-8', errors='replace'), int(returncode)
+
+    @staticmethod
+    async def _read_until(stream: asyncio.StreamReader, marker: bytes, max_bytes: Optional[int]) -> Tuple[bytes, bytes]:
+        """
+        Read a stream up to a sentinel line.
+
+        Args:
+            stream (asyncio.StreamReader): Output stream of the session shell
+            marker (bytes): Sentinel prefix, followed by the exit status and a newline
+            max_bytes (int, optional): Output bytes to keep; the first and last
+                half are kept and the middle is replaced by a note. None keeps all.
+
+        Returns:
+            tuple: (output before the sentinel, exit status after it)
+
+        Raises:
+            ConnectionError: If the shell exits before printing the sentinel
+        """
+        head = bytearray()
+        buffer = bytearray()
+        elided = 0
+        half = max_bytes // 2 if max_bytes is not None else None
+        search_from = 0
+        while True:
+            chunk = await stream.read(65536)
+            if not chunk:
+                raise ConnectionError("Container shell exited unexpectedly")
+            buffer += chunk
+            start = buffer.find(marker, search_from)
+            if start != -1:
+                end = buffer.find(b'\n', start + len(marker))
+                if end != -1:
+                    status = bytes(buffer[start + len(marker):end])
+                    del buffer[start:]
+                    break
+                continue
+            search_from = max(0, len(buffer) - len(marker))
+            if half is not None and len(buffer) > half + len(marker):
+                # Only a possible partial marker beyond the tail needs to stay unsearched
+                overflow = len(buffer) - half - len(marker)
+                taken = min(overflow, half - len(head))
+                head += buffer[:taken]
+                elided += overflow - taken
+                del buffer[:overflow]
+                search_from -= overflow
+
+        if half is not None and len(head) + len(buffer) > max_bytes:
+            overflow = len(buffer) - half
+            taken = min(overflow, half - len(head))
+            head += buffer[:taken]
+            elided += overflow - taken
+            del buffer[:overflow]
+        if elided:
+            head += f"\n... <{elided} bytes elided> ...\n".encode('ascii')
+        return bytes(head + buffer), status
@@ -1,24 +1,37 @@
 import asyncio
 import base64
+import hashlib
+import shlex
 from agentpress.tool import Tool, ToolResult, openapi_schema, xml_schema
 from agentpress.state_manager import StateManager
 import os
 from typing import List, Optional, Literal
 from pathlib import Path
 from tools.bash_tool import BashTool
+from tools.container_shell import ContainerShell
 
 class EditTool(Tool):
-    def __init__(self, container_name: str, state_file: str):
+    # Undo snapshots are kept per file inside the container, newest last
+    HISTORY_DIR = '/tmp/edit_tool_history'
+    MAX_HISTORY = 50
+
+    def __init__(self, container_name: str, state_file: str, bash_tool: Optional[BashTool] = None):
         super().__init__()
         self.container_name = container_name
         self.state_manager = StateManager(store_file=state_file)
         self.environment_setup = (
             f'. /opt/miniconda3/etc/profile.d/conda.sh && '
             f'conda activate testbed && '
-            f'cd /testbed && '
+            f'cd /testbed'
         )
-        self.file_history = {}  # For undo_edit command
-        self.bash_tool = BashTool(container_name, state_file)  # Instantiate BashTool
+        # Edits read and write whole files through this shell, so its output is never truncated
+        self.shell = ContainerShell(container_name, setup_command=self.environment_setup, max_output_bytes=None)
+        # Share the registered BashTool, if given, instead of opening more sessions
+        self.bash_tool = bash_tool or BashTool(container_name, state_file)
+
+    async def close(self):
+        """Terminate this tool's session and those of its BashTool."""
+        await asyncio.gather(self.shell.close(), self.bash_tool.close())
 
     async def execute_command_in_container(self, command: str):
         """
@@ -30,23 +43,31 @@ class EditTool(Tool):
         Returns:
             tuple: (stdout, stderr, returncode)
         """
-        full_command = (
-            f'{self.environment_setup}'
-            f'{command}'
-        )
-        cmd = [
-            'docker', 'exec',
-            '-i',  # Interactive mode
-            self.container_name,
-            '/bin/bash', '-c', full_command
-        ]
-        process = await asyncio.create_subprocess_exec(
-            *cmd,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE
+        return await self.shell.run(command, timeout=None)
+
+    def _history_file(self, path: str) -> str:
+        """Path of the container-side undo history for a file."""
+        # Hashing keeps the name short and free of '/' however long the path is
+        return os.path.join(self.HISTORY_DIR, hashlib.sha1(path.encode()).hexdigest())
+
+    def _save_history_command(self, path: str) -> str:
+        """
+        Build a shell command that snapshots a file's current content for undo_edit.
+
+        Parameters:
+            path (str): The absolute file path to snapshot.
+
+        Returns:
+            str: Command appending the base64 content to the file's history, capped at MAX_HISTORY entries
+        """
+        quoted_path = shlex.quote(path)
+        history_file = shlex.quote(self._history_file(path))
+        return (
+            f'mkdir -p {self.HISTORY_DIR} && '
+            f'{{ base64 -w0 {quoted_path}; echo; }} >> {history_file} && '
+            f'tail -n {self.MAX_HISTORY} {history_file} > {history_file}.tmp && '
+            f'mv {history_file}.tmp {history_file}'
         )
-        stdout, stderr = await process.communicate()
-        return stdout.decode(), stderr.decode(), process.returncode
 
     Command = Literal[
         "create",
@@ -285,31 +306,19 @@ class EditTool(Tool):
             - `ToolResult`: The result indicating success or failure.
         """
         try:
-            # Save current content for undo if file exists
-            backup_command = f'cat "{path}"'
-            stdout, stderr, returncode = await self.execute_command_in_container(backup_command)
-            if returncode == 0:
-                self.file_history.setdefault(path, []).append(stdout)
-                print(f"Backup of existing file at {path} saved for undo.")
-            else:
-                print(f"No existing file at {path} to backup.")
-
-            # Create directory if it doesn't exist
+            # Snapshot any existing content, create the directory and write the file in one call;
+            # the write does not depend on the snapshot succeeding
+            quoted_path = shlex.quote(path)
             directory = os.path.dirname(path)
-            if directory:
-                mkdir_command = f'mkdir -p "{directory}"'
-                await self.execute_command_in_container(mkdir_command)
-                print(f"Directory {directory} created.")
-
-            # Encode and write content to file using base64
             encoded_content = base64.b64encode(content.encode()).decode()
-            command = f'echo "{encoded_content}" | base64 -d > "{path}"'
+            command = (
+                f'if [ -f {quoted_path} ]; then {self._save_history_command(path)}; fi; '
+                + (f'mkdir -p {shlex.quote(directory)} && ' if directory else '')
+                + f'echo "{encoded_content}" | base64 -d > {quoted_path}'
+            )
             stdout, stderr, returncode = await self.execute_command_in_container(command)
             if returncode != 0:
                 return self.fail_response(f"Failed to create file: {stderr.strip()}")
-
-            # Save new content for undo
-            self.file_history.setdefault(path, []).append(content)
             print(f"File {path} created with provided content.")
 
             return self.success_response(f"File created at {path}")
@@ -337,6 +346,8 @@ import os
 path = sys.argv[1]
 old_str = base64.b64decode(sys.argv[2]).decode('utf-8')
 new_str = base64.b64decode(sys.argv[3]).decode('utf-8')
+history_file = sys.argv[4]
+max_history = int(sys.argv[5])
 
 # Read the file content
 with open(path, 'r') as f:
@@ -350,12 +361,18 @@ elif occurrences > 1:
     print(f"The string '{{old_str}}' was found multiple times in the file. Please ensure it is unique.", file=sys.stderr)
     sys.exit(1)
 
-# Save current content for undo
-history_dir = '/tmp/edit_tool_history'
-os.makedirs(history_dir, exist_ok=True)
-history_file = os.path.join(history_dir, base64.b64encode(path.encode()).decode())
-with open(history_file, 'a') as hf:
-    hf.write(base64.b64encode(content.encode()).decode() + '\\n')
+# Save current content for undo; a failed snapshot must not block the edit
+try:
+    os.makedirs(os.path.dirname(history_file), exist_ok=True)
+    with open(history_file, 'a') as hf:
+        hf.write(base64.b64encode(content.encode()).decode() + '\\n')
+    with open(history_file) as hf:
+        snapshots = hf.readlines()
+    if len(snapshots) > max_history:
+        with open(history_file, 'w') as hf:
+            hf.writelines(snapshots[-max_history:])
+except OSError:
+    pass
 
 # Replace the old string with the new string
 new_content = content.replace(old_str, new_str, 1)
@@ -394,7 +411,8 @@ print(f"Successfully replaced string in `" + path + "`.")
             # Build the command to execute inside the container
             command = (
                 f"echo {bash_single_quote(code_base64)} | base64 -d | "
-                f"python3 - {escaped_path} {escaped_old_str_base64} {escaped_new_str_base64}"
+                f"python3 - {escaped_path} {escaped_old_str_base64} {escaped_new_str_base64} "
+                f"{bash_single_quote(self._history_file(path))} {self.MAX_HISTORY}"
             )
 
             print(f"Executing command inside container: {command}")
@@ -438,20 +456,18 @@ print(f"Successfully replaced string in `" + path + "`.")
             if insert_line < 1 or insert_line > len(lines) + 1:
                 return self.fail_response(f"Parameter 'insert_line' ({insert_line}) is out of bounds.")
 
-            # Save current content for undo
-            self.file_history.setdefault(path, []).append(stdout)
-            print(f"Backup of {path} saved for undo.")
-
             # Insert the new string at the specified line
             lines.insert(insert_line - 1, new_str)
             new_content = '\n'.join(lines)
 
             # Write using base64 decode
             encoded_content = base64.b64encode(new_content.encode()).decode()
-            command = f'echo "{encoded_content}" | base64 -d > "{path}"'
+            # Snapshot the current content for undo in the same call as the write, which runs either way
+            command = f'{self._save_history_command(path)}; echo "{encoded_content}" | base64 -d > {shlex.quote(path)}'
             stdout, stderr, returncode = await self.execute_command_in_container(command)
             if returncode != 0:
                 return self.fail_response(f"Failed to write file: {stderr.strip()}")
+            print(f"Backup of {path} saved for undo.")
 
             print(f"Text inserted into {path} at line {insert_line}")
             return self.success_response(f"Inserted text into {path} at line {insert_line}")
@@ -472,18 +488,17 @@ print(f"Successfully replaced string in `" + path + "`.")
         try:
             print(f"Attempting to undo last edit on {path}")
             # Use the history file inside the container
-            history_dir = '/tmp/edit_tool_history'
-            encoded_path = base64.b64encode(path.encode()).decode()
-            history_file = os.path.join(history_dir, encoded_path)
+            history_file = self._history_file(path)
 
-            # Read the history
-            command = f'if [ -f "{history_file}" ]; then tail -n 1 "{history_file}"; else echo ""; fi'
+            # Read the number of snapshots and the latest one; an empty file's snapshot is an empty line
+            command = f'if [ -f "{history_file}" ]; then wc -l < "{history_file}"; tail -n 1 "{history_file}"; else echo 0; fi'
             stdout, stderr, returncode = await self.execute_command_in_container(command)
-            if stdout.strip() == '':
+            count, _, previous_content_base64 = stdout.partition('\n')
+            if int(count.strip() or 0) == 0:
                 print(f"No edits to undo for {path}")
                 return self.fail_response(f"No edits to undo for {path}.")
 
-            previous_content_base64 = stdout.strip()
+            previous_content_base64 = previous_content_base64.strip()
 
             # Remove the last entry from history
             command = f'sed -i \'$d\' "{history_file}"'
@@ -3,7 +3,6 @@ import os
 import json
 from pathlib import Path
 from typing import List, Dict
-import re
 import sys
 
 def load_evaluation_result(run_dir: str) -> Dict:
@@ -92,13 +91,11 @@ def format_message_content(content):
     if isinstance(content, str):
         return content
     elif isinstance(content, list):
-        formatted_content = []
-        for item in content:
-            if item.get('type') == 'text':
-                formatted_content.append(item['text'])
-            elif item.get('type') == 'image_url':
-                formatted_content.append(f"![Image]({item['url']})")
-        return "\n".join(formatted_content)
+        return "\n".join(
+            item['text'] if item.get('type') == 'text' else f"![Image]({item['url']})"
+            for item in content
+            if item.get('type') in ('text', 'image_url')
+        )
     return str(content)
 
 def truncate_text(text: str, max_lines: int = 10) -> str: